@@ -1,84 +1,136 @@
 # backend/catalyst_impact.py
 
 import math
-from dataclasses import dataclass
-from typing import List, Dict
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
 
+import numpy as np
 
-# ---------------------------------------------
-# Catalyst Instance (from Supabase)
-# ---------------------------------------------
-@dataclass
-class CatalystInstance:
-    id: str
-    type_id: str
-    name: str
-    lat: float
-    lng: float
+try:
+    from catalyst_kernel import score as _score_kernel
+    from catalyst_kernel import score_batch as _score_batch_kernel
+except ImportError:  # numba not installed -> vectorized NumPy path
+    _score_kernel = _score_batch_kernel = None
 
-    # Dynamic spatial impact parameters
-    r_peak_miles: float
-    r_max_miles: float
-    decay_k_miles: float
-    base_strength: float
+try:
+    import numexpr as ne
+except ImportError:  # batch paths fall back to plain NumPy ufuncs
+    ne = None
 
 
 # ---------------------------------------------
-# OPTIONAL: Legacy Type Profiles (still useful)
+# Catalyst Arrays (SoA layout for vectorized scoring)
 # ---------------------------------------------
+R_MILES = 6371.0 * 0.621371  # Earth radius, km -> miles folded in once
+
+
 @dataclass
-class CatalystTypeProfile:
-    type_id: str
-    label: str
-    r_peak_miles: float
-    r_max_miles: float
-    decay_k_miles: float
-    base_strength: float
-
-
-# Your old type catalog — unchanged (kept for future if needed)
-CATALYST_TYPES: Dict[str, CatalystTypeProfile] = {
-    "ev_gigafactory": CatalystTypeProfile(
-        type_id="ev_gigafactory",
-        label="EV / Battery Gigafactory",
-        r_peak_miles=10.0,
-        r_max_miles=60.0,
-        decay_k_miles=8.0,
-        base_strength=1.0,
-    ),
-    "auto_tier1": CatalystTypeProfile(
-        type_id="auto_tier1",
-        label="Automotive Tier-1 Supplier",
-        r_peak_miles=5.0,
-        r_max_miles=20.0,
-        decay_k_miles=4.0,
-        base_strength=0.8,
-    ),
-    "semiconductor_fab": CatalystTypeProfile(
-        type_id="semiconductor_fab",
-        label="Semiconductor Fab",
-        r_peak_miles=15.0,
-        r_max_miles=70.0,
-        decay_k_miles=10.0,
-        base_strength=1.1,
-    ),
-    "logistics_hub": CatalystTypeProfile(
-        type_id="logistics_hub",
-        label="Logistics Hub",
-        r_peak_miles=4.0,
-        r_max_miles=15.0,
-        decay_k_miles=3.0,
-        base_strength=0.9,
-    ),
-    # ... (rest unchanged)
-}
+class CatalystArrays:
+    """One contiguous float64 array per catalyst field, aligned by index."""
+    lat: np.ndarray
+    lng: np.ndarray
+    r_peak_miles: np.ndarray
+    r_max_miles: np.ndarray
+    decay_k_miles: np.ndarray
+    base_strength: np.ndarray
+
+    # 1 / max(decay_k_miles, 1e-6): the decay multiplies instead of divides
+    inv_decay_k: np.ndarray
+
+    # Half-widths of the degree box outside which the catalyst can't reach
+    # a parcel, see bbox_tolerances_deg
+    lat_tol_deg: np.ndarray
+    lng_tol_deg: np.ndarray
+
+    # Catalyst ids, aligned with the float columns (metadata only)
+    ids: Optional[np.ndarray] = field(default=None, repr=False)
+
+    # Latitude bands for the Numba kernel: rows are sorted by band, then
+    # longitude, and band b spans rows band_starts[b]:band_starts[b + 1].
+    # band_lng_tol is the widest lng_tol_deg in each band.
+    band_starts: Optional[np.ndarray] = field(default=None, repr=False)
+    band_lng_tol: Optional[np.ndarray] = field(default=None, repr=False)
+    max_lat_tol: float = 0.0
+
+    def __len__(self) -> int:
+        return self.lat.shape[0]
+
+    def build_index(self) -> "CatalystArrays":
+        if not len(self):
+            return self
+
+        # Reorder rows into bands unless they already are (arrays mapped
+        # from the disk cache were sorted before they were written)
+        band = latitude_band(self.lat)
+        order = np.lexsort((self.lng, band))
+        if not np.array_equal(order, np.arange(len(self))):
+            for f in ARRAY_FIELDS:
+                setattr(self, f, getattr(self, f)[order])
+            if self.ids is not None:
+                self.ids = self.ids[order]
+            band = band[order]
+
+        n_bands = int(round(180 / INDEX_BAND_DEG))
+        self.band_starts = np.searchsorted(band, np.arange(n_bands + 1)).astype(np.int64)
+        self.band_lng_tol = np.zeros(n_bands)
+        np.maximum.at(self.band_lng_tol, band, self.lng_tol_deg)
+        self.max_lat_tol = float(self.lat_tol_deg.max())
+        return self
+
+    def take(self, idx: np.ndarray) -> "CatalystArrays":
+        return CatalystArrays(
+            **{f: getattr(self, f)[idx] for f in ARRAY_FIELDS},
+            ids=None if self.ids is None else self.ids[idx],
+        )
+
+    def to_matrix(self) -> np.ndarray:
+        """(len(ARRAY_FIELDS), N) float64; each row is one C-contiguous column."""
+        return np.stack([getattr(self, f) for f in ARRAY_FIELDS])
+
+    @classmethod
+    def from_matrix(
+        cls, matrix: np.ndarray, ids: Optional[np.ndarray] = None
+    ) -> "CatalystArrays":
+        return cls(
+            **{f: matrix[i] for i, f in enumerate(ARRAY_FIELDS)},
+            ids=ids,
+        ).build_index()
+
+
+# Height of the latitude bands CatalystArrays.build_index sorts rows into.
+# About the widest reach (r_max ~100 mi ~ 1.5 deg), so a parcel touches
+# only a handful of bands.
+INDEX_BAND_DEG = 1.0
+
+
+def latitude_band(lat):
+    """Index of the INDEX_BAND_DEG band counted from the south pole."""
+    n_bands = int(round(180 / INDEX_BAND_DEG))
+    return np.clip(((lat + 90.0) // INDEX_BAND_DEG).astype(np.intp), 0, n_bands - 1)
+
+
+# Float columns of CatalystArrays, in storage order
+ARRAY_FIELDS = (
+    "lat",
+    "lng",
+    "r_peak_miles",
+    "r_max_miles",
+    "decay_k_miles",
+    "base_strength",
+    "inv_decay_k",
+    "lat_tol_deg",
+    "lng_tol_deg",
+)
 
 
 # ---------------------------------------------
 # Haversine Distance
 # ---------------------------------------------
 def haversine_miles(lat1, lon1, lat2, lon2):
-    R_km = 6371.0
     d_lat = math.radians(lat2 - lat1)
     d_lon = math.radians(lon2 - lon1)
     a = (
@@ -88,49 +140,454 @@ def haversine_miles(lat1, lon1, lat2, lon2):
         math.sin(d_lon / 2)**2
     )
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    km = R_km * c
-    return km * 0.621371  # convert to miles
+    return R_MILES * c
 
 
 # ---------------------------------------------
-# Impact Decay Function
+# Equirectangular Distance (impact decay only)
 # ---------------------------------------------
-def impact_weight(distance_miles, r_peak, r_max, k):
-    if distance_miles <= r_peak:
-        return 1.0
-    if distance_miles >= r_max:
-        return 0.0
-    return math.exp(-(distance_miles - r_peak) / max(k, 1e-6))
+# Within catalyst range (r_max is tens of miles) this is within ~0.5% of
+# haversine, far below the decay tolerance, and needs no trig once the
+# parcel's cos(lat) is known. Use haversine_miles for user-facing distances.
+MILES_PER_DEGREE = R_MILES * math.pi / 180  # ~69.09
+
+
+def fast_dist_miles_np(plat, plng, cos_plat, clats, clngs):
+    d_lng = (clngs - plng + 180.0) % 360.0 - 180.0
+    return np.hypot(
+        (clats - plat) * MILES_PER_DEGREE,
+        d_lng * (MILES_PER_DEGREE * cos_plat),
+    )
+
+
+def bbox_tolerances_deg(lats, r_max_miles):
+    """
+    Per-catalyst (lat_tol, lng_tol) in degrees: a parcel with
+    |d_lat| >= lat_tol or |d_lng| >= lng_tol is >= r_max away by
+    fast_dist_miles_np, since
+      d >= |d_lat| * MILES_PER_DEGREE
+      d >= |d_lng| * MILES_PER_DEGREE * cos(parcel lat)
+    and inside the latitude band cos(parcel lat) >= cos(|lat| + lat_tol).
+    Padded slightly so rounding never drops a catalyst right at r_max;
+    the decay cut-off takes care of those.
+    """
+    lat_tol = r_max_miles / MILES_PER_DEGREE * (1 + 1e-9)
+    min_cos = np.cos(np.radians(np.minimum(np.abs(lats) + lat_tol, 90.0)))
+    # Near the poles the band spans every longitude
+    lng_tol = np.minimum(lat_tol / min_cos, 360.0)
+    return lat_tol, lng_tol
+
+
+# ---------------------------------------------
+# Fast exp (Schraudolph 1999)
+# ---------------------------------------------
+# Writes a scaled x straight into the exponent bits of a float64.
+# Max relative error is ~4% on [-20, 0], over the 1% the decay allows, so
+# it is opt-in: set PROPAI_FAST_EXP=1 to trade accuracy for speed.
+FAST_EXP = os.getenv("PROPAI_FAST_EXP", "0") == "1"
+
+_EXP_A = 1512775.3951951856  # 2**20 / ln(2)
+_EXP_B = 1072632447          # 1023 * 2**20 - 60801 (RMS-error correction)
+
+
+def fast_exp_np(x):
+    x = np.asarray(x, dtype=np.float64)
+    bits = (_EXP_A * np.maximum(x, -20.0) + _EXP_B).astype(np.int64) << 32
+    return np.where(x < -20, 0.0, bits.view(np.float64))
+
+
+_exp_np = fast_exp_np if FAST_EXP else np.exp
+
+
+# ---------------------------------------------
+# Vectorized Impact Decay
+# ---------------------------------------------
+def reachable_np(parcel_lat, parcel_lng, catalysts):
+    """
+    Cheap bounding-box test: False where the catalyst is provably >= r_max
+    from the parcel, so its weight is 0 and the distance can be skipped.
+    Two compares per catalyst against its precomputed degree tolerances.
+    """
+    d_lat = np.abs(catalysts.lat - parcel_lat)
+    d_lng = np.abs(catalysts.lng - parcel_lng)
+    d_lng = np.minimum(d_lng, 360.0 - d_lng)  # wrap at the antimeridian
+    return (d_lat < catalysts.lat_tol_deg) & (d_lng < catalysts.lng_tol_deg)
+
+
+def impact_weight_np(distance_miles, r_peak, r_max, inv_k):
+    # inv_k is CatalystArrays.inv_decay_k, i.e. 1 / max(k, 1e-6)
+    decay = _exp_np((r_peak - distance_miles) * inv_k)
+    return np.where(
+        distance_miles <= r_peak,
+        1.0,
+        np.where(distance_miles >= r_max, 0.0, decay),
+    )
 
 
 # ---------------------------------------------
 # Scoring Function Using Dynamic Catalysts
 # ---------------------------------------------
+def _kernel_args(catalysts):
+    """catalyst_kernel.score / score_batch arguments after the parcel."""
+    return (
+        catalysts.band_starts,
+        catalysts.band_lng_tol,
+        catalysts.max_lat_tol,
+        INDEX_BAND_DEG,
+        catalysts.lat,
+        catalysts.lng,
+        catalysts.lat_tol_deg,
+        catalysts.lng_tol_deg,
+        catalysts.r_peak_miles,
+        catalysts.r_max_miles,
+        catalysts.inv_decay_k,
+        catalysts.base_strength,
+        FAST_EXP,
+    )
+
+
 def compute_catalyst_score_for_parcel(
     parcel_lat: float,
     parcel_lng: float,
-    catalysts: List[CatalystInstance],
+    catalysts: CatalystArrays,
 ) -> float:
 
-    if not catalysts:
+    if not len(catalysts):
         return 0.0
 
-    total = 0.0
-    strength_sum = 0.0
+    # The kernel walks the latitude bands itself, which is cheaper than
+    # masking every catalyst plus copying out the subset
+    if _score_kernel is not None and catalysts.band_starts is not None:
+        return _score_kernel(
+            float(parcel_lat),
+            float(parcel_lng),
+            *_kernel_args(catalysts),
+        )
 
-    for c in catalysts:
-        # Use dynamic parameters from CatalystInstance
-        d = haversine_miles(parcel_lat, parcel_lng, c.lat, c.lng)
-        w = impact_weight(d, c.r_peak_miles, c.r_max_miles, c.decay_k_miles)
+    # Drop catalysts the bounding box already rules out before any trig.
+    # Exact for the equirectangular decay at any latitude, unlike a
+    # great-circle radius query (see bbox_tolerances_deg).
+    reachable = reachable_np(parcel_lat, parcel_lng, catalysts)
+    catalysts = catalysts.take(np.flatnonzero(reachable))
 
-        if w <= 0:
-            continue
+    # Use dynamic parameters from CatalystArrays, one ufunc pass per step
+    d = fast_dist_miles_np(
+        parcel_lat,
+        parcel_lng,
+        math.cos(math.radians(parcel_lat)),
+        catalysts.lat,
+        catalysts.lng,
+    )
+    w = impact_weight_np(
+        d,
+        catalysts.r_peak_miles,
+        catalysts.r_max_miles,
+        catalysts.inv_decay_k,
+    )
 
-        total += w * c.base_strength
-        strength_sum += c.base_strength
+    # Only catalysts that actually reach the parcel count toward the norm
+    hit = w > 0
+    strength_sum = catalysts.base_strength[hit].sum()
 
     if strength_sum == 0:
         return 0.0
 
-    score = total / strength_sum
+    total = (w[hit] * catalysts.base_strength[hit]).sum()
+    score = float(total / strength_sum)
     return max(0.0, min(score, 1.5))
+
+
+# ---------------------------------------------
+# Parcel Score Cache
+# ---------------------------------------------
+class ParcelScoreCache:
+    """
+    Thread-safe LRU of catalyst scores keyed on the exact (lat, lng).
+
+    Repeat queries for a parcel (e.g. re-clicks) are served from memory.
+    Keys aren't quantized: the score jumps where a catalyst's r_max cuts
+    it out of the norm, so a neighbouring point's score can be far off.
+    Call clear() whenever the catalyst set changes.
+    """
+
+    def __init__(self, maxsize: int = 65536):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[float, float], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(
+        self,
+        parcel_lat: float,
+        parcel_lng: float,
+        compute: Callable[[float, float], float],
+    ) -> float:
+        key = (parcel_lat, parcel_lng)
+
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # Compute outside the lock so concurrent misses don't serialize
+        value = compute(*key)
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# ---------------------------------------------
+# Batch Scoring
+# ---------------------------------------------
+# Bound on the (parcels x catalysts) bounding-box test of the NumPy batch
+# path: parcels are masked in row blocks of at most this many pair elements
+# (~8 MB per float64 temporary).
+BATCH_BLOCK_ELEMENTS = 1_000_000
+
+
+# numexpr versions of fast_dist_miles_np / impact_weight_np: one fused,
+# blocked loop per expression instead of a full-size temporary per step
+_NE_DIST_MILES = (
+    "sqrt(((clat - plat) * M)**2 + "
+    "(((clng - plng + 180.0) % 360.0 - 180.0) * (M * cos_plat))**2)"
+)
+_NE_IMPACT_WEIGHT = "where(d <= r_peak, 1.0, where(d >= r_max, 0.0, exp((r_peak - d) * inv_k)))"
+
+
+def _pair_weights(plat, plng, cos_plat, clat, clng, r_peak, r_max, inv_k):
+    """impact_weight_np(fast_dist_miles_np(...)) for the batch paths."""
+    if ne is None:
+        d = fast_dist_miles_np(plat, plng, cos_plat, clat, clng)
+        return impact_weight_np(d, r_peak, r_max, inv_k)
+
+    d = ne.evaluate(_NE_DIST_MILES, local_dict={
+        "plat": plat, "plng": plng, "cos_plat": cos_plat,
+        "clat": clat, "clng": clng, "M": MILES_PER_DEGREE,
+    })
+    if FAST_EXP:
+        # numexpr can't do the exponent-bits trick; keep fast_exp_np so
+        # batch scores match the single-parcel scorer
+        return impact_weight_np(d, r_peak, r_max, inv_k)
+    return ne.evaluate(_NE_IMPACT_WEIGHT, local_dict={
+        "d": d, "r_peak": r_peak, "r_max": r_max, "inv_k": inv_k,
+    })
+
+
+def _normalized_scores(total, strength_sum):
+    # Same normalisation as the single-parcel scorer: only catalysts with
+    # w > 0 count toward each parcel's strength sum
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = np.where(strength_sum > 0, total / strength_sum, 0.0)
+    return np.clip(scores, 0.0, 1.5)
+
+
+def _scores_from_pairs(parcel_lats, parcel_lngs, catalysts):
+    """Score only (parcel, catalyst) pairs inside the catalyst's bounding box."""
+    n = parcel_lats.shape[0]
+    scores = np.zeros(n)
+
+    block = max(1, BATCH_BLOCK_ELEMENTS // len(catalysts))
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+
+        # (P, C) bounding-box mask; only its hits get distances and decay
+        pi, ci = np.nonzero(reachable_np(
+            parcel_lats[start:stop, None], parcel_lngs[start:stop, None], catalysts
+        ))
+
+        plat = parcel_lats[start + pi]
+        w = _pair_weights(
+            plat,
+            parcel_lngs[start + pi],
+            np.cos(np.radians(plat)),
+            catalysts.lat[ci],
+            catalysts.lng[ci],
+            catalysts.r_peak_miles[ci],
+            catalysts.r_max_miles[ci],
+            catalysts.inv_decay_k[ci],
+        )
+        strength = catalysts.base_strength[ci]
+
+        scores[start:stop] = _normalized_scores(
+            np.bincount(pi, weights=w * strength, minlength=stop - start),
+            np.bincount(pi, weights=(w > 0) * strength, minlength=stop - start),
+        )
+
+    return scores
+
+
+def compute_catalyst_scores_for_parcels(
+    parcel_lats: np.ndarray,
+    parcel_lngs: np.ndarray,
+    catalysts: CatalystArrays,
+) -> np.ndarray:
+    """Vectorized compute_catalyst_score_for_parcel over many parcels."""
+    parcel_lats = np.asarray(parcel_lats, dtype=np.float64)
+    parcel_lngs = np.asarray(parcel_lngs, dtype=np.float64)
+
+    if not len(catalysts) or not parcel_lats.shape[0]:
+        return np.zeros(parcel_lats.shape[0])
+
+    # Same kernel as the single-parcel scorer, parallel over parcels
+    if _score_batch_kernel is not None and catalysts.band_starts is not None:
+        return _score_batch_kernel(
+            np.ascontiguousarray(parcel_lats),
+            np.ascontiguousarray(parcel_lngs),
+            *_kernel_args(catalysts),
+        )
+
+    return _scores_from_pairs(parcel_lats, parcel_lngs, catalysts)
+
+
+# ---------------------------------------------
+# Precomputed Decay Grid
+# ---------------------------------------------
+# Catalysts change at most hourly, parcels are scored constantly: sample the
+# score once on a lat/lng raster and answer parcels with an array lookup.
+GRID_BAND_ELEMENTS = 2_000_000  # cells per accumulation band (~32 MB)
+GRID_MAX_CELLS = 40_000_000     # refuse rasters larger than this
+
+# Storage for the raster. Scores only need ~1% precision, so half floats
+# (max error ~7e-4 on [0, 1.5]) halve RAM and cache footprint; "uint8"
+# quantizes to 255 levels of a per-grid scale for constrained instances.
+GRID_DTYPES = ("float32", "float16", "uint8")
+
+
+@dataclass
+class CatalystGrid:
+    """
+    Catalyst scores at the centres of a step-degree raster covering every
+    catalyst's reach. Lookups snap to the nearest centre; outside the
+    raster no catalyst reaches, so the score is 0. Stored values are
+    multiplied by `scale` on the way out (1.0 unless quantized).
+    """
+    lat0: float
+    lng0: float
+    step: float
+    values: np.ndarray  # (n_lat, n_lng)
+    scale: float = 1.0
+
+    def lookup(self, parcel_lat: float, parcel_lng: float) -> float:
+        i = round((parcel_lat - self.lat0) / self.step)
+        j = round((parcel_lng - self.lng0) / self.step)
+        n_lat, n_lng = self.values.shape
+        if 0 <= i < n_lat and 0 <= j < n_lng:
+            return float(self.values[i, j]) * self.scale
+        return 0.0
+
+    def lookup_many(self, parcel_lats: np.ndarray, parcel_lngs: np.ndarray) -> np.ndarray:
+        i = np.rint((parcel_lats - self.lat0) / self.step).astype(np.intp)
+        j = np.rint((parcel_lngs - self.lng0) / self.step).astype(np.intp)
+        n_lat, n_lng = self.values.shape
+        inside = (i >= 0) & (i < n_lat) & (j >= 0) & (j < n_lng)
+
+        scores = np.zeros(parcel_lats.shape[0])
+        scores[inside] = self.values[i[inside], j[inside]]
+        if self.scale != 1.0:
+            scores *= self.scale
+        return scores
+
+
+def build_catalyst_grid(
+    catalysts: CatalystArrays, step: float = 0.01, dtype: str = "float16"
+) -> Optional[CatalystGrid]:
+    """
+    Rasterize compute_catalyst_score_for_parcel by stamping each catalyst's
+    weights onto the cells inside its bounding box. Returns None when the
+    raster would exceed GRID_MAX_CELLS or a reach box crosses the
+    antimeridian / a pole (longitude wrap isn't modelled); callers then
+    score parcels directly.
+    """
+    # Checked first so a bad setting fails before seconds of rasterizing
+    if dtype not in GRID_DTYPES:
+        raise ValueError(f"dtype must be one of {GRID_DTYPES}, got {dtype!r}")
+    if not len(catalysts):
+        return None
+
+    lat_lo = catalysts.lat - catalysts.lat_tol_deg
+    lat_hi = catalysts.lat + catalysts.lat_tol_deg
+    lng_lo = catalysts.lng - catalysts.lng_tol_deg
+    lng_hi = catalysts.lng + catalysts.lng_tol_deg
+    if lat_lo.min() < -90 or lat_hi.max() > 90 or lng_lo.min() < -180 or lng_hi.max() > 180:
+        return None
+
+    lat0, lng0 = float(lat_lo.min()), float(lng_lo.min())
+    n_lat = int(math.ceil((lat_hi.max() - lat0) / step)) + 1
+    n_lng = int(math.ceil((lng_hi.max() - lng0) / step)) + 1
+    if n_lat * n_lng > GRID_MAX_CELLS:
+        return None
+
+    grid_lats = lat0 + step * np.arange(n_lat)
+    grid_lngs = lng0 + step * np.arange(n_lng)
+    cos_lats = np.cos(np.radians(grid_lats))
+
+    # First/last+1 row and column of each catalyst's box
+    row0 = np.maximum(np.floor((lat_lo - lat0) / step).astype(np.intp), 0)
+    row1 = np.minimum(np.ceil((lat_hi - lat0) / step).astype(np.intp) + 1, n_lat)
+    col0 = np.maximum(np.floor((lng_lo - lng0) / step).astype(np.intp), 0)
+    col1 = np.minimum(np.ceil((lng_hi - lng0) / step).astype(np.intp) + 1, n_lng)
+
+    values = np.zeros((n_lat, n_lng), dtype=np.float32)
+    band = max(1, GRID_BAND_ELEMENTS // n_lng)
+
+    # One band of rows at a time bounds the float64 temporaries; bands
+    # write disjoint rows of `values`, and NumPy releases the GIL.
+    def fill_band(b0):
+        b1 = min(b0 + band, n_lat)
+        total = np.zeros((b1 - b0, n_lng))
+        strength_sum = np.zeros((b1 - b0, n_lng))
+
+        for c in np.flatnonzero((row0 < b1) & (row1 > b0)):
+            r0, r1 = max(row0[c], b0), min(row1[c], b1)
+            c0, c1 = col0[c], col1[c]
+            w = _pair_weights(
+                grid_lats[r0:r1, None],
+                grid_lngs[None, c0:c1],
+                cos_lats[r0:r1, None],
+                catalysts.lat[c],
+                catalysts.lng[c],
+                catalysts.r_peak_miles[c],
+                catalysts.r_max_miles[c],
+                catalysts.inv_decay_k[c],
+            )
+            strength = catalysts.base_strength[c]
+            total[r0 - b0:r1 - b0, c0:c1] += w * strength
+            strength_sum[r0 - b0:r1 - b0, c0:c1] += (w > 0) * strength
+
+        values[b0:b1] = _normalized_scores(total, strength_sum)
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        list(pool.map(fill_band, range(0, n_lat, band)))
+
+    scale = 1.0
+    if dtype == "uint8":
+        scale = max(float(values.max()), 1e-12) / 255
+        values = np.rint(values / scale).astype(np.uint8)
+    elif dtype == "float16":
+        values = values.astype(np.float16)
+
+    return CatalystGrid(lat0=lat0, lng0=lng0, step=step, values=values, scale=scale)
@@ -0,0 +1,155 @@
+# backend/catalyst_kernel.py
+#
+# Numba-compiled catalyst scoring kernel.
+# Fuses distance + impact decay + weighted accumulate into a single pass
+# over the SoA arrays, with no temporary arrays.
+
+import math
+
+import numpy as np
+from numba import config, njit, prange
+
+# score_batch runs from FastAPI's threadpool, so concurrent requests launch
+# it from several threads at once; the fallback workqueue layer aborts the
+# process on that. Require TBB (see requirements.txt) or OpenMP instead.
+config.THREADING_LAYER = "threadsafe"
+
+
+R_MILES = 6371.0 * 0.621371
+MILES_PER_DEGREE = R_MILES * math.pi / 180
+
+# Same constants as catalyst_impact.fast_exp_np (Schraudolph 1999)
+_EXP_A = 1512775.3951951856
+_EXP_B = 1072632447
+
+
+@njit("f8(f8)", cache=True, inline="always")
+def fast_exp(x):
+    if x < -20:
+        return 0.0
+    bits = np.int64(np.int64(_EXP_A * x + _EXP_B) << 32)
+    return bits.view(np.float64)
+
+
+@njit(inline="always")
+def _accumulate(
+    i0, i1, plat, plng, cos_plat, lats, lngs, lat_tol, lng_tol,
+    rpeak, rmax, inv_k, strength, use_fast_exp,
+):
+    """(sum w*strength, sum strength over w > 0) for catalysts i0..i1-1."""
+    total = 0.0
+    strength_sum = 0.0
+
+    for i in range(i0, i1):
+        # Bounding-box reject against the precomputed degree tolerances
+        # (see catalyst_impact.bbox_tolerances_deg)
+        d_lat = lats[i] - plat
+        if abs(d_lat) >= lat_tol[i]:
+            continue
+        d_lng = (lngs[i] - plng + 180.0) % 360.0 - 180.0
+        if abs(d_lng) >= lng_tol[i]:
+            continue
+
+        # Equirectangular distance (see catalyst_impact.fast_dist_miles_np)
+        dy = MILES_PER_DEGREE * d_lat
+        dx = MILES_PER_DEGREE * cos_plat * d_lng
+        d = math.sqrt(dx * dx + dy * dy)
+
+        # Impact decay
+        if d <= rpeak[i]:
+            w = 1.0
+        elif d >= rmax[i]:
+            continue
+        else:
+            x = (rpeak[i] - d) * inv_k[i]
+            w = fast_exp(x) if use_fast_exp else math.exp(x)
+
+        total += w * strength[i]
+        strength_sum += strength[i]
+
+    return total, strength_sum
+
+
+# Explicit signature => compiled eagerly at import (and cached on disk),
+# so the first /score request never pays for compilation.
+# Serial on purpose: after band culling a parcel sees tens of catalysts,
+# where waking a thread pool costs more than the loop itself.
+# `use_fast_exp` is an argument (not a global) so the on-disk cache stays
+# valid whichever way PROPAI_FAST_EXP is set.
+@njit(
+    "f8(f8,f8,i8[::1],f8[::1],f8,f8,f8[::1],f8[::1],f8[::1],f8[::1],f8[::1],f8[::1],f8[::1],f8[::1],b1)",
+    cache=True,
+    fastmath=True,
+)
+def score(
+    plat, plng, band_starts, band_lng_tol, max_lat_tol, band_deg,
+    lats, lngs, lat_tol, lng_tol, rpeak, rmax, inv_k, strength, use_fast_exp,
+):
+    # Catalysts are sorted into latitude bands of band_deg, by longitude
+    # within each band (see CatalystArrays.build_index): scan only the
+    # bands and longitude windows a catalyst could reach the parcel from.
+    cos_plat = math.cos(math.radians(plat))
+    n_bands = band_starts.shape[0] - 1
+    b0 = max(int(math.floor((plat - max_lat_tol + 90.0) / band_deg)), 0)
+    b1 = min(int(math.floor((plat + max_lat_tol + 90.0) / band_deg)), n_bands - 1)
+
+    total = 0.0
+    strength_sum = 0.0
+
+    for b in range(b0, b1 + 1):
+        start = band_starts[b]
+        stop = band_starts[b + 1]
+        if start == stop:
+            continue
+
+        lo = plng - band_lng_tol[b]
+        hi = plng + band_lng_tol[b]
+        if hi - lo >= 360.0:
+            windows = ((start, stop), (stop, stop))
+        else:
+            band_lngs = lngs[start:stop]
+            # A window past +-180 continues at the other end of the band
+            i_lo = start + np.searchsorted(band_lngs, max(lo, -180.0))
+            i_hi = start + np.searchsorted(band_lngs, min(hi, 180.0), side="right")
+            if lo < -180.0:
+                wrap = (start + np.searchsorted(band_lngs, lo + 360.0), stop)
+            elif hi > 180.0:
+                wrap = (start, start + np.searchsorted(band_lngs, hi - 360.0, side="right"))
+            else:
+                wrap = (stop, stop)
+            windows = ((i_lo, i_hi), wrap)
+
+        for i0, i1 in windows:
+            t, s = _accumulate(
+                i0, i1, plat, plng, cos_plat, lats, lngs, lat_tol, lng_tol,
+                rpeak, rmax, inv_k, strength, use_fast_exp,
+            )
+            total += t
+            strength_sum += s
+
+    if strength_sum == 0:
+        return 0.0
+
+    s = total / strength_sum
+    return max(0.0, min(s, 1.5))
+
+
+# Parallel over parcels: a batch is thousands of independent score() calls,
+# plenty of work per thread to amortize the pool that a single parcel can't.
+@njit(
+    "f8[::1](f8[::1],f8[::1],i8[::1],f8[::1],f8,f8,f8[::1],f8[::1],f8[::1],f8[::1],f8[::1],f8[::1],f8[::1],f8[::1],b1)",
+    cache=True,
+    fastmath=True,
+    parallel=True,
+)
+def score_batch(
+    plats, plngs, band_starts, band_lng_tol, max_lat_tol, band_deg,
+    lats, lngs, lat_tol, lng_tol, rpeak, rmax, inv_k, strength, use_fast_exp,
+):
+    out = np.empty(plats.shape[0])
+    for p in prange(plats.shape[0]):
+        out[p] = score(
+            plats[p], plngs[p], band_starts, band_lng_tol, max_lat_tol, band_deg,
+            lats, lngs, lat_tol, lng_tol, rpeak, rmax, inv_k, strength, use_fast_exp,
+        )
+    return out
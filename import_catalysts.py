@@ -9,11 +9,11 @@
 #
 # You can gradually remove seed items as live sources expand.
 
+import functools
 import os
-import math
 from datetime import datetime
 
-from supabase import create_client
+from supabase_client import create_supabase_client
 
 # --- NEW: rule-driven state incentive loader ---
 from state_incentives import load_all_state_incentives
@@ -27,15 +27,19 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 if not SUPABASE_URL or not SUPABASE_KEY:
     raise RuntimeError("SUPABASE_URL and SUPABASE_KEY must be set in env")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase = create_supabase_client(SUPABASE_URL, SUPABASE_KEY)
 
 
 # ------------------------- HELPERS -------------------------
 
+# Fixed for the duration of an ingestion run
+_NOW_YEAR = datetime.utcnow().year
+
+
+@functools.lru_cache(maxsize=64)
 def recency_tier_from_year(year: int) -> str:
     """Simple recency tier logic."""
-    now_year = datetime.utcnow().year
-    age = now_year - year
+    age = _NOW_YEAR - year
     if age <= 1:
         return "A"
     elif age <= 3:
@@ -199,34 +203,36 @@ def seed_catalysts() -> list[dict]:
 
 # ------------------------- UPSERT LOGIC -------------------------
 
+UPSERT_CHUNK_SIZE = 500  # rows per request, keeps PostgREST bodies small
+
+
 def upsert_catalysts(rows: list[dict]):
-    """Insert or update catalysts using (name, state, type) uniqueness."""
+    """
+    Insert or update catalysts using (name, state, type) uniqueness.
+
+    Relies on the unique index from
+    supabase/migrations/20261014000000_catalysts_name_state_type_key.sql,
+    so each chunk is a single round-trip instead of a SELECT + write per row.
+    """
 
     if not rows:
         print("No catalysts to upsert.")
         return
 
-    for row in rows:
-        name = row["name"]
-        state = row["state"]
-        type_id = row["type"]
+    # Postgres rejects an upsert that touches the same key twice in one
+    # statement, so keep only the last row per (name, state, type).
+    unique = {(r["name"], r["state"], r["type"]): r for r in rows}
+    rows = list(unique.values())
 
-        existing = (
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        chunk = rows[start:start + UPSERT_CHUNK_SIZE]
+        (
             supabase.table("catalysts")
-            .select("id")
-            .eq("name", name)
-            .eq("state", state)
-            .eq("type", type_id)
+            .upsert(chunk, on_conflict="name,state,type", returning="minimal")
             .execute()
         )
 
-        if existing.data:
-            catalyst_id = existing.data[0]["id"]
-            print(f"Updating catalyst: {name} ({state}, {type_id})")
-            supabase.table("catalysts").update(row).eq("id", catalyst_id).execute()
-        else:
-            print(f"Inserting catalyst: {name} ({state}, {type_id})")
-            supabase.table("catalysts").insert(row).execute()
+    print(f"Upserted {len(rows)} catalysts.")
 
 
 # ------------------------- MASTER PIPELINE -------------------------
@@ -235,9 +241,9 @@ def main():
     print("Loading seed catalysts...")
     catalysts = seed_catalysts()
 
+    # The state feeds are downloaded in parallel inside the loader
     print("Loading dynamic state incentive catalysts...")
-    state_rows = load_all_state_incentives()
-    catalysts.extend(state_rows)
+    catalysts.extend(load_all_state_incentives())
 
     print(f"Prepared {len(catalysts)} total catalysts to upsert.")
     upsert_catalysts(catalysts)
@@ -1,24 +1,50 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-import math
+from fastapi.openapi.utils import get_openapi
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+import fcntl
+import functools
+import hashlib
+import msgspec
+import numpy as np
 import os
+import re
+import tempfile
 
 # Catalyst Engine
 from catalyst_impact import (
-    CatalystInstance,
+    ARRAY_FIELDS,
+    CatalystArrays,
+    ParcelScoreCache,
+    bbox_tolerances_deg,
+    build_catalyst_grid,
     compute_catalyst_score_for_parcel,
+    compute_catalyst_scores_for_parcels,
 )
 
-# Supabase Client
-from supabase import create_client
+# POI arithmetic (mypyc-compiled when built, see poi_score.py)
+from poi_score import COMPOSITE_WEIGHTS, POI_WEIGHTS, compute_poi
 
-app = FastAPI()
+# Supabase Client (shared HTTP/2 connection pool)
+from supabase_client import create_supabase_client
+
+# Same C encoder family as the request decoding: much cheaper than
+# json.dumps for these float-heavy payloads
+_ENCODER = msgspec.json.Encoder()
+
+
+class MsgspecJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return _ENCODER.encode(content)
+
+
+app = FastAPI(default_response_class=MsgspecJSONResponse)
 
 # ---------------- SUPABASE CONNECTION ----------------
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase = create_supabase_client(SUPABASE_URL, SUPABASE_KEY)
 
 # Allow frontend
 app.add_middleware(
@@ -32,49 +58,201 @@ app.add_middleware(
 
 
 # ---------------- CATALYST LOADER ----------------
-def load_catalysts_from_supabase():
+def fetch_catalysts_from_supabase():
     response = supabase.table("catalysts").select("*").execute()
     rows = response.data
-    catalysts = []
 
-    for row in rows:
-        radius = float(row.get("radius_miles") or 10)
+    # Build each column once and derive parameters with array ops; no
+    # per-row catalyst objects are needed for scoring.
+    def column(key, default):
+        return np.array(
+            [row.get(key) or default for row in rows], dtype=np.float64
+        )
+
+    lat = np.array([row["lat"] for row in rows], dtype=np.float64)
+    lng = np.array([row["lng"] for row in rows], dtype=np.float64)
+    radius = column("radius_miles", 10)
+    capex = column("capex_usd", 0)
+    jobs = column("jobs_estimated", 0)
+
+    base_strength = np.where(
+        capex > 0,
+        np.maximum(0.5, np.log10(np.maximum(capex, 1))),
+        np.where(jobs > 0, np.maximum(0.5, jobs / 500), 1.0),
+    )
+
+    r_max = radius * 2.5
+    decay_k = np.maximum(1.0, radius / 3)
+    lat_tol, lng_tol = bbox_tolerances_deg(lat, r_max)
+
+    return CatalystArrays(
+        lat=lat,
+        lng=lng,
+        r_peak_miles=radius,
+        r_max_miles=r_max,
+        decay_k_miles=decay_k,
+        base_strength=base_strength,
+        inv_decay_k=1.0 / decay_k,
+        lat_tol_deg=lat_tol,
+        lng_tol_deg=lng_tol,
+        ids=np.array([row["id"] for row in rows], dtype=str),
+    ).build_index()
+
+
+# ---------------- CATALYST ARRAY CACHE ----------------
+# Parsed catalyst arrays are stored as .npy files keyed on the table version
+# and memory-mapped on startup, so extra workers share one copy through the
+# OS page cache instead of each re-fetching and re-parsing the table.
+# Bump CATALYST_CACHE_FORMAT whenever the row -> array derivation changes.
+CATALYST_CACHE_FORMAT = 5
+CATALYST_CACHE_DIR = os.getenv("PROPAI_CATALYST_CACHE_DIR", tempfile.gettempdir())
+
+
+def catalyst_table_version():
+    """(max updated_at, row count) of the catalysts table, or None."""
+    try:
+        response = (
+            supabase.table("catalysts")
+            .select("updated_at", count="exact")
+            .order("updated_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+    except Exception as e:
+        print(f"Catalyst cache disabled, can't read table version: {e}")
+        return None
+    latest = response.data[0]["updated_at"] if response.data else None
+    return latest, response.count
+
+
+def catalyst_cache_path(version):
+    key = repr((CATALYST_CACHE_FORMAT, ARRAY_FIELDS, version))
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return os.path.join(CATALYST_CACHE_DIR, f"propai_catalysts_{digest}")
+
+
+def read_catalyst_cache(path):
+    # Copy-on-write mapping: pages stay shared across workers (we never
+    # write), and unlike mmap_mode="r" the rows stay usable by the Numba
+    # kernel's writable-array signature.
+    try:
+        matrix = np.load(path + ".npy", mmap_mode="c")
+        ids = np.load(path + "_ids.npy")
+    except OSError as e:
+        # A worker that saw a newer table version may have pruned these
+        # files between our exists() check and the load
+        print(f"Could not read catalyst cache {path}: {e}")
+        return fetch_catalysts_from_supabase()
+    return CatalystArrays.from_matrix(matrix, ids=ids)
+
+
+def write_catalyst_cache(path, catalysts):
+    # Write to temp names then rename, so readers never see partial files
+    for suffix, array in (("_ids.npy", catalysts.ids), (".npy", catalysts.to_matrix())):
+        tmp = f"{path}.{os.getpid()}.tmp{suffix}"
+        np.save(tmp, array)
+        os.replace(tmp, path + suffix)
+
+
+def prune_catalyst_cache(path):
+    # Drop files left by older table versions. Workers still mapping one
+    # keep their pages; the data goes away when the last mapping closes.
+    keep = os.path.basename(path)
+    for name in os.listdir(CATALYST_CACHE_DIR):
+        if name.startswith("propai_catalysts_") and not name.startswith(keep):
+            try:
+                os.remove(os.path.join(CATALYST_CACHE_DIR, name))
+            except OSError:
+                pass
+
 
-        r_peak = radius
-        r_max = radius * 2.5
-        decay_k = max(1.0, radius / 3)
+def load_catalysts_from_supabase():
+    version = catalyst_table_version()
+    if version is None:
+        return fetch_catalysts_from_supabase()
+
+    path = catalyst_cache_path(version)
+    if os.path.exists(path + ".npy"):
+        return read_catalyst_cache(path)
+
+    # Only one worker fetches; the others wait on the lock, then map its file
+    try:
+        os.makedirs(CATALYST_CACHE_DIR, exist_ok=True)
+        lock = open(os.path.join(CATALYST_CACHE_DIR, "propai_catalysts.lock"), "w")
+    except OSError as e:
+        print(f"Catalyst cache disabled, can't lock {CATALYST_CACHE_DIR}: {e}")
+        return fetch_catalysts_from_supabase()
+
+    with lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if os.path.exists(path + ".npy"):
+            return read_catalyst_cache(path)
+
+        catalysts = fetch_catalysts_from_supabase()
+        try:
+            write_catalyst_cache(path, catalysts)
+            prune_catalyst_cache(path)
+        except OSError as e:
+            print(f"Could not write catalyst cache {path}: {e}")
+        return catalysts
+
+
+# Catalyst scores per parcel; only valid for the current CATALYSTS
+CATALYST_SCORE_CACHE = ParcelScoreCache(maxsize=65536)
+
+
+# Catalyst scores rasterized at startup (see CatalystGrid): parcels become an
+# array lookup. Opt-in with PROPAI_CATALYST_GRID=1: the score jumps where a
+# catalyst's r_max cuts it out of the norm, so snapping to a cell centre has
+# no useful error bound (0.3 seen near those edges). Off scores exactly.
+CATALYST_GRID_ENABLED = os.getenv("PROPAI_CATALYST_GRID", "0") == "1"
+CATALYST_GRID_DEG = float(os.getenv("PROPAI_CATALYST_GRID_DEG", "0.01"))
+CATALYST_GRID_DTYPE = os.getenv("PROPAI_CATALYST_GRID_DTYPE", "float16")
+
+
+def reload_catalysts():
+    global CATALYSTS, CATALYST_GRID
+    CATALYSTS = load_catalysts_from_supabase()
+    CATALYST_GRID = (
+        build_catalyst_grid(CATALYSTS, CATALYST_GRID_DEG, CATALYST_GRID_DTYPE)
+        if CATALYST_GRID_ENABLED else None
+    )
+    CATALYST_SCORE_CACHE.clear()
+    _score_impl.cache_clear()
+
+
+def catalyst_score(lat, lng):
+    return compute_catalyst_score_for_parcel(
+        parcel_lat=lat,
+        parcel_lng=lng,
+        catalysts=CATALYSTS,
+    )
 
-        capex = row.get("capex_usd") or 0
-        jobs = row.get("jobs_estimated") or 0
 
-        if capex > 0:
-            base_strength = max(0.5, math.log10(capex))
-        elif jobs > 0:
-            base_strength = max(0.5, jobs / 500)
-        else:
-            base_strength = 1.0
+# Whole /score results for repeated requests (same parcel, same inputs).
+# The key is the exact request, so a hit returns exactly what a miss would
+# compute. Each entry holds a 29-float key (~1.4 KB), so keep it small.
+SCORE_CACHE_SIZE = int(os.getenv("PROPAI_SCORE_CACHE_SIZE", "4096"))
 
-        catalysts.append(CatalystInstance(
-            id=row["id"],
-            type_id=row["type"],
-            name=row["name"],
-            lat=row["lat"],
-            lng=row["lng"],
-            r_peak_miles=r_peak,
-            r_max_miles=r_max,
-            decay_k_miles=decay_k,
-            base_strength=base_strength,
-        ))
 
-    return catalysts
+@functools.lru_cache(maxsize=SCORE_CACHE_SIZE)
+def _score_impl(key):
+    lat, lng = key[:2]
+    if CATALYST_GRID is not None:
+        catalyst_decay_impact = CATALYST_GRID.lookup(lat, lng)
+    else:
+        catalyst_decay_impact = CATALYST_SCORE_CACHE.get_or_compute(lat, lng, catalyst_score)
+    return (*compute_poi(key[2:]), catalyst_decay_impact)
 
 
-# Load once at startup
-CATALYSTS = load_catalysts_from_supabase()
+# Load once at startup (SoA arrays, see CatalystArrays)
+reload_catalysts()
 
 
 # ---------------- INPUT SCHEMA ----------------
-class PropertyInput(BaseModel):
+# msgspec decodes + validates the flat float payload in C, well ahead of
+# Pydantic. strict=False keeps Pydantic's lax coercion (e.g. "0.5" -> 0.5).
+class PropertyInput(msgspec.Struct):
     lat: float
     lng: float
 
@@ -112,79 +290,226 @@ class PropertyInput(BaseModel):
     epa: float
 
 
-# ---------------- SCORING ENGINE ----------------
-@app.post("/score")
-def score_property(p: PropertyInput):
+_DECODER = msgspec.json.Decoder(PropertyInput, strict=False)
+_BATCH_DECODER = msgspec.json.Decoder(list[PropertyInput], strict=False)
 
-    catalyst_decay_impact = compute_catalyst_score_for_parcel(
-        parcel_lat=p.lat,
-        parcel_lng=p.lng,
-        catalysts=CATALYSTS,
-    )
+# The endpoints read the raw body, so FastAPI can't see the schema; publish
+# msgspec's own JSON schema for the request bodies in /openapi.json instead
+(_INPUT_SCHEMA, _BATCH_SCHEMA), _SCHEMA_COMPONENTS = msgspec.json.schema_components(
+    (PropertyInput, list[PropertyInput]),
+    ref_template="#/components/schemas/{name}",
+)
 
-    value_anomaly = (
-        0.50 * p.price_anomaly +
-        0.30 * p.replacement_delta +
-        0.15 * p.historical_delta +
-        0.05 * p.dom_score
-    )
 
-    catalyst_base = (
-        0.40 * p.distance_score +
-        0.25 * p.capex_score +
-        0.20 * p.jobs_score +
-        0.10 * p.sector_rel +
-        0.03 * p.cluster +
-        0.02 * p.media_tone
-    )
+def _json_body(schema):
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}},
+        }
+    }
 
-    catalyst_adj = catalyst_base * (1 + p.recency_multiplier)
 
-    asset_upside = (
-        0.45 * p.zoning_flex +
-        0.35 * p.utilities +
-        0.20 * p.topo_index
-    )
+def openapi():
+    if app.openapi_schema is None:
+        schema = get_openapi(title=app.title, version=app.version, routes=app.routes)
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(
+            _SCHEMA_COMPONENTS
+        )
+        app.openapi_schema = schema
+    return app.openapi_schema
 
-    market_momentum = (
-        0.30 * p.job_growth +
-        0.25 * p.permits +
-        0.20 * p.population +
-        0.15 * p.traffic +
-        0.05 * p.macro_cycle +
-        0.05 * p.inst_cluster
-    )
 
-    incentive_score = (
-        0.45 * p.oz +
-        0.30 * p.hub +
-        0.25 * p.tif
-    )
+app.openapi = openapi
 
-    risk_penalty = (
-        0.40 * p.crime +
-        0.35 * p.flood +
-        0.15 * p.wildfire +
-        0.10 * p.epa
-    )
 
-    poi_raw = (
-        0.25 * value_anomaly +
-        0.20 * catalyst_adj +
-        0.15 * asset_upside +
-        0.15 * market_momentum +
-        0.10 * incentive_score -
-        0.15 * risk_penalty
-    )
+# Model inputs in PropertyInput field order (everything after lat/lng)
+FEATURES = PropertyInput.__struct_fields__[2:]
 
-    poi = round(100 * poi_raw)
 
-    if poi >= 75:
-        tier = "Gold"
-    elif poi >= 50:
-        tier = "Silver"
+# Indexed by (poi >= 50) + (poi >= 75)
+TIERS = ("Bronze", "Silver", "Gold")
+_TIERS_ARR = np.array(TIERS)
+
+
+# ---------------- VECTORIZED SCORING WEIGHTS ----------------
+# Single parcels go through compute_poi; for many parcels the same weights
+# as (features,) vectors turn the arithmetic into one matmul.
+def _weight_row(weights):
+    return [weights.get(f, 0.0) for f in FEATURES]
+
+
+# Rows: value_anomaly, catalyst_base, asset_upside, market_momentum,
+# incentive_score, risk_penalty
+_W_COMPOSITES = np.array(
+    [_weight_row(w) for w in COMPOSITE_WEIGHTS.values()], dtype=np.float64
+)
+
+# poi_raw with the outer weights folded into the inputs' coefficients:
+#   poi_raw = _W_POI @ x + recency_multiplier * (0.20 * catalyst_base)
+_OUTER = np.array(
+    [POI_WEIGHTS["catalyst_adj"] if c == "catalyst_base" else POI_WEIGHTS[c]
+     for c in COMPOSITE_WEIGHTS],
+    dtype=np.float64,
+)
+_W_POI = _OUTER @ _W_COMPOSITES
+
+# One (features x 7) matrix: six composites plus the linear part of poi_raw
+_W_SCORES = np.vstack([_W_COMPOSITES, _W_POI]).T
+_IDX_RECENCY = FEATURES.index("recency_multiplier")
+
+
+def compute_poi_np(X: np.ndarray):
+    """
+    compute_poi for a (parcels x features) matrix. Returns the composite
+    sub-scores as an (N, 6) array (catalyst_base replaced by catalyst_adj)
+    and poi_raw as an (N,) array.
+    """
+    scores = X @ _W_SCORES
+    recency = X[:, _IDX_RECENCY]
+    catalyst_base = scores[:, 1]
+
+    poi_raw = scores[:, 6] + recency * (POI_WEIGHTS["catalyst_adj"] * catalyst_base)
+    scores[:, 1] = catalyst_base * (1 + recency)
+    return scores[:, :6], poi_raw
+
+
+def check_poi_weights():
+    """
+    compute_poi spells the weights out by hand; fail at startup if they
+    drifted from COMPOSITE_WEIGHTS / POI_WEIGHTS, since /score and the
+    batch endpoints would then quietly disagree. Each unit vector checks
+    one linear term, each unit vector plus recency one catalyst_adj term.
+    """
+    eye = np.eye(len(FEATURES))
+    X = np.vstack([eye, eye + eye[_IDX_RECENCY]])
+    composites, poi_raw = compute_poi_np(X)
+    expected = np.array([compute_poi(tuple(row)) for row in X.tolist()])
+    if not np.allclose(np.column_stack([composites, poi_raw]), expected):
+        raise RuntimeError(
+            "compute_poi and COMPOSITE_WEIGHTS/POI_WEIGHTS disagree; "
+            "update both copies of the weights in poi_score.py"
+        )
+
+
+check_poi_weights()
+
+
+# msgspec reports where an error is as a suffix like " - at `$[0].lat`"
+_ERROR_PATH = re.compile(r" - at `\$(.*)`$")
+_ERROR_PATH_PART = re.compile(r"\[(\d+)\]|\.([^.\[]+)")
+_MISSING_FIELD = re.compile(r"^Object missing required field `([^`]+)`")
+
+
+def validation_error_detail(e: Exception):
+    """
+    One-item list in FastAPI's 422 shape ({"loc", "msg", "type"}), so
+    clients written against the Pydantic errors keep parsing `detail`.
+    """
+    msg = str(e)
+    error_type = "value_error" if isinstance(e, msgspec.ValidationError) else "json_invalid"
+    loc = ["body"]
+
+    at = _ERROR_PATH.search(msg)
+    if at:
+        msg = msg[:at.start()]
+        loc += [int(i) if i else key for i, key in _ERROR_PATH_PART.findall(at.group(1))]
+    missing = _MISSING_FIELD.match(msg)
+    if missing:
+        error_type = "missing"
+        loc.append(missing.group(1))
+
+    return [{"loc": loc, "msg": msg, "type": error_type}]
+
+
+def decode_body(body: bytes, decoder=_DECODER):
+    try:
+        return decoder.decode(body)
+    except (msgspec.ValidationError, msgspec.DecodeError) as e:
+        raise HTTPException(status_code=422, detail=validation_error_detail(e))
+
+
+# ---------------- SCORING ENGINE ----------------
+@app.post("/score", openapi_extra=_json_body(_INPUT_SCHEMA))
+async def score_property(request: Request):
+    p = decode_body(await request.body())
+
+    key = msgspec.structs.astuple(p)
+    # Returned as a Response so FastAPI skips jsonable_encoder on plain floats
+    return MsgspecJSONResponse(poi_response(*_score_impl(key)))
+
+
+# Largest batch one request may score; bigger lists get a 413
+MAX_BATCH_PARCELS = 10_000
+
+
+def score_batch_body(body: bytes):
+    parcels = decode_body(body, _BATCH_DECODER)
+    if len(parcels) > MAX_BATCH_PARCELS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BATCH_PARCELS} parcels per request, got {len(parcels)}",
+        )
+    return score_properties(parcels)
+
+
+@app.post("/score_batch", openapi_extra=_json_body(_BATCH_SCHEMA))
+@app.post("/score_many", openapi_extra=_json_body(_BATCH_SCHEMA))
+async def score_properties_batch(request: Request):
+    # Decoding and scoring a batch takes long enough to stall every other
+    # request on the event loop, so it runs in the threadpool
+    body = await request.body()
+    return MsgspecJSONResponse(await run_in_threadpool(score_batch_body, body))
+
+
+def score_properties(parcels):
+    """Score many parcels at once; same output per parcel as /score."""
+    parcel_lats = np.array([p.lat for p in parcels], dtype=np.float64)
+    parcel_lngs = np.array([p.lng for p in parcels], dtype=np.float64)
+    if CATALYST_GRID is not None:
+        catalyst_scores = CATALYST_GRID.lookup_many(parcel_lats, parcel_lngs)
     else:
-        tier = "Bronze"
+        # Same scorer as /score, run over all parcels at once
+        catalyst_scores = compute_catalyst_scores_for_parcels(
+            parcel_lats, parcel_lngs, CATALYSTS
+        )
+
+    # Sub-scores and poi_raw for every parcel in one matmul
+    X = np.array(
+        [msgspec.structs.astuple(p)[2:] for p in parcels], dtype=np.float64
+    ).reshape(len(parcels), len(FEATURES))
+    composites, poi_raw = compute_poi_np(X)
+
+    # np.rint rounds half to even, like round() in poi_response
+    poi = np.rint(100 * poi_raw).astype(np.int64)
+    tiers = _TIERS_ARR[(poi >= 50).astype(np.intp) + (poi >= 75)]
+
+    columns = {
+        "poi": poi.tolist(),
+        "tier": tiers.tolist(),
+        "value_anomaly": composites[:, 0].tolist(),
+        "catalyst_adj": composites[:, 1].tolist(),
+        "catalyst_decay_impact": catalyst_scores.tolist(),
+        "asset_upside": composites[:, 2].tolist(),
+        "market_momentum": composites[:, 3].tolist(),
+        "incentive_score": composites[:, 4].tolist(),
+        "risk_penalty": composites[:, 5].tolist(),
+    }
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def poi_response(
+    value_anomaly,
+    catalyst_adj,
+    asset_upside,
+    market_momentum,
+    incentive_score,
+    risk_penalty,
+    poi_raw,
+    catalyst_decay_impact,
+):
+    poi = round(100 * poi_raw)
+    tier = TIERS[(poi >= 50) + (poi >= 75)]
 
     return {
         "poi": poi,
@@ -197,3 +522,19 @@ def score_property(p: PropertyInput):
         "incentive_score": incentive_score,
         "risk_penalty": risk_penalty,
     }
+
+
+# ---------------- METRICS ----------------
+@app.get("/metrics")
+def metrics():
+    return {
+        "catalysts": len(CATALYSTS),
+        "catalyst_grid": CATALYST_GRID and {
+            "shape": CATALYST_GRID.values.shape,
+            "step_deg": CATALYST_GRID.step,
+            "dtype": str(CATALYST_GRID.values.dtype),
+            "bytes": CATALYST_GRID.values.nbytes,
+        },
+        "catalyst_score_cache": CATALYST_SCORE_CACHE.stats(),
+        "score_cache": _score_impl.cache_info()._asdict(),
+    }
@@ -0,0 +1,147 @@
+# backend/poi_score.py
+#
+# Pure-arithmetic POI scoring for a single parcel.
+# Kept free of FastAPI / NumPy imports so it can be compiled ahead of time
+# with mypyc (`mypyc poi_score.py`, see railway.toml). The compiled
+# extension shadows this file on import; without it this runs as plain
+# Python with identical results.
+
+from typing import Dict, Tuple
+
+# Documented weights. compute_poi spells them out as straight-line
+# arithmetic so mypyc can emit plain C float ops -- keep the two in sync.
+COMPOSITE_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "value_anomaly": {
+        "price_anomaly": 0.50,
+        "replacement_delta": 0.30,
+        "historical_delta": 0.15,
+        "dom_score": 0.05,
+    },
+    "catalyst_base": {
+        "distance_score": 0.40,
+        "capex_score": 0.25,
+        "jobs_score": 0.20,
+        "sector_rel": 0.10,
+        "cluster": 0.03,
+        "media_tone": 0.02,
+    },
+    "asset_upside": {
+        "zoning_flex": 0.45,
+        "utilities": 0.35,
+        "topo_index": 0.20,
+    },
+    "market_momentum": {
+        "job_growth": 0.30,
+        "permits": 0.25,
+        "population": 0.20,
+        "traffic": 0.15,
+        "macro_cycle": 0.05,
+        "inst_cluster": 0.05,
+    },
+    "incentive_score": {
+        "oz": 0.45,
+        "hub": 0.30,
+        "tif": 0.25,
+    },
+    "risk_penalty": {
+        "crime": 0.40,
+        "flood": 0.35,
+        "wildfire": 0.15,
+        "epa": 0.10,
+    },
+}
+
+# Outer weights combining the composites into poi_raw. catalyst_adj is
+# catalyst_base * (1 + recency_multiplier); risk_penalty is subtracted.
+POI_WEIGHTS: Dict[str, float] = {
+    "value_anomaly": 0.25,
+    "catalyst_adj": 0.20,
+    "asset_upside": 0.15,
+    "market_momentum": 0.15,
+    "incentive_score": 0.10,
+    "risk_penalty": -0.15,
+}
+
+
+def compute_poi(
+    values: Tuple[float, ...],
+) -> Tuple[float, float, float, float, float, float, float]:
+    """
+    Sub-scores and raw POI from the model inputs in PropertyInput field
+    order (main.FEATURES). Returns (value_anomaly, catalyst_adj,
+    asset_upside, market_momentum, incentive_score, risk_penalty, poi_raw).
+    """
+    (
+        price_anomaly, replacement_delta, historical_delta, dom_score,
+        distance_score, capex_score, jobs_score, sector_rel, cluster,
+        media_tone, recency_multiplier,
+        zoning_flex, utilities, topo_index,
+        job_growth, permits, population, traffic, macro_cycle, inst_cluster,
+        oz, hub, tif,
+        crime, flood, wildfire, epa,
+    ) = values
+
+    value_anomaly = (
+        0.50 * price_anomaly +
+        0.30 * replacement_delta +
+        0.15 * historical_delta +
+        0.05 * dom_score
+    )
+
+    catalyst_base = (
+        0.40 * distance_score +
+        0.25 * capex_score +
+        0.20 * jobs_score +
+        0.10 * sector_rel +
+        0.03 * cluster +
+        0.02 * media_tone
+    )
+
+    catalyst_adj = catalyst_base * (1 + recency_multiplier)
+
+    asset_upside = (
+        0.45 * zoning_flex +
+        0.35 * utilities +
+        0.20 * topo_index
+    )
+
+    market_momentum = (
+        0.30 * job_growth +
+        0.25 * permits +
+        0.20 * population +
+        0.15 * traffic +
+        0.05 * macro_cycle +
+        0.05 * inst_cluster
+    )
+
+    incentive_score = (
+        0.45 * oz +
+        0.30 * hub +
+        0.25 * tif
+    )
+
+    risk_penalty = (
+        0.40 * crime +
+        0.35 * flood +
+        0.15 * wildfire +
+        0.10 * epa
+    )
+
+    poi_raw = (
+        0.25 * value_anomaly +
+        0.20 * catalyst_adj +
+        0.15 * asset_upside +
+        0.15 * market_momentum +
+        0.10 * incentive_score -
+        0.15 * risk_penalty
+    )
+
+    return (
+        value_anomaly,
+        catalyst_adj,
+        asset_upside,
+        market_momentum,
+        incentive_score,
+        risk_penalty,
+        poi_raw,
+    )
@@ -5,13 +5,22 @@
 
 from __future__ import annotations
 
-import csv
-import io
+import functools
+import hashlib
+import json
 import math
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 
 
 # ======================================================
@@ -127,12 +136,14 @@ MIN_CAPEX = 50_000_000    # $50M minimum
 MIN_JOBS = 200            # OR 200 jobs
 MAX_AGE_YEARS = 7         # Ignore projects older than this
 
+# Fixed for the duration of an ingestion run
+_NOW_YEAR = datetime.utcnow().year
+
 
 def passes_rules(capex_usd: Optional[float], jobs: Optional[int], year: Optional[int]) -> bool:
     """Return True if project should become a catalyst."""
     if year:
-        now_year = datetime.utcnow().year
-        if now_year - year > MAX_AGE_YEARS:
+        if _NOW_YEAR - year > MAX_AGE_YEARS:
             return False
     capex_good = (capex_usd is not None) and (capex_usd >= MIN_CAPEX)
     jobs_good = (jobs is not None) and (jobs >= MIN_JOBS)
@@ -172,39 +183,76 @@ def normalize_year(v: Any) -> Optional[int]:
     return None
 
 
+# Column-wise equivalents for the CSV path; the per-value functions above
+# are kept for the JSON feed, whose rows skip the pandas pipeline.
+
+def clean_numeric(col: pd.Series) -> pd.Series:
+    """normalize_float over a CSV column (NaN if missing or unparseable)."""
+    if pd.api.types.is_numeric_dtype(col):
+        # Clean column, already parsed in C by read_csv
+        return col.astype("float64")
+    # Plain numbers still parse in one C pass; only the leftovers
+    # ("$1,200") pay for the per-cell string cleanup.
+    num = pd.to_numeric(col, errors="coerce").astype("float64")
+    retry = num.isna() & col.notna()
+    if retry.any():
+        cleaned = col[retry].str.strip().str.replace(r"[,$]", "", regex=True)
+        num[retry] = pd.to_numeric(cleaned, errors="coerce")
+    return num
+
+
+def clean_year(col: pd.Series) -> pd.Series:
+    """normalize_year over a column of strings (NaN where it gives None)."""
+    s = col.str.strip()
+    year = pd.to_numeric(s.str[:4].where(s.str.len() >= 4), errors="coerce")
+    return year.where(year % 1 == 0)
+
+
 # ======================================================
 # CLASSIFICATION — infer type_id + radius
 # ======================================================
 
+# Sector keywords in priority order: the first rule with any keyword in
+# the (lower-cased) sector wins. Plain substring tests, so "ev" also
+# matches inside longer words.
+_SECTOR_RULES = (
+    (("battery", "ev"), "ev_gigafactory"),
+    (("auto",), "auto_assembly"),
+    (("semi", "chip"), "semiconductor_fab"),
+    (("logistic", "distribution", "fulfillment"), "logistics_hub"),
+    (("data center",), "data_center_cluster"),
+    (("hydrogen", "solar", "wind"), "energy_cluster"),
+)
+_KEYWORD_RANK = {kw: rank for rank, (kws, _) in enumerate(_SECTOR_RULES) for kw in kws}
+# Zero-width lookahead, so one scan reports every (even overlapping) keyword
+_SECTOR_RE = re.compile("(?=(" + "|".join(map(re.escape, _KEYWORD_RANK)) + "))")
+
+
+@functools.lru_cache(maxsize=4096)
+def _sector_type_id(sector: str) -> Optional[str]:
+    ranks = [_KEYWORD_RANK[m.group(1)] for m in _SECTOR_RE.finditer(sector.lower())]
+    return _SECTOR_RULES[min(ranks)][1] if ranks else None
+
+
 def classify_type_id(sector: Optional[str], cfg: StateSourceConfig) -> str:
     if not sector:
         return cfg.default_type_id
-    s = sector.lower()
+    return _sector_type_id(sector) or cfg.default_type_id
 
-    if "battery" in s or "ev" in s:
-        return "ev_gigafactory"
-    if "auto" in s:
-        return "auto_assembly"
-    if "semi" in s or "chip" in s:
-        return "semiconductor_fab"
-    if "logistic" in s or "distribution" in s or "fulfillment" in s:
-        return "logistics_hub"
-    if "data center" in s:
-        return "data_center_cluster"
-    if "hydrogen" in s or "solar" in s or "wind" in s:
-        return "energy_cluster"
 
-    return cfg.default_type_id
+# Base impact radius per type (miles), scaled by capex in infer_radius_miles
+_BASE_RADIUS_MILES = {
+    "ev_gigafactory": 15,
+    "semiconductor_fab": 20,
+    "logistics_hub": 8,
+    "data_center_cluster": 20,
+    "energy_cluster": 25,
+}
+_DEFAULT_BASE_RADIUS_MILES = 10
 
 
 def infer_radius_miles(type_id: str, capex_usd: Optional[float]) -> float:
-    base = {
-        "ev_gigafactory": 15,
-        "semiconductor_fab": 20,
-        "logistics_hub": 8,
-        "data_center_cluster": 20,
-        "energy_cluster": 25,
-    }.get(type_id, 10)
+    base = _BASE_RADIUS_MILES.get(type_id, _DEFAULT_BASE_RADIUS_MILES)
 
     if capex_usd:
         scale = max(0.7, min(1.5, math.log10(capex_usd) - 5))
@@ -213,11 +261,11 @@ def infer_radius_miles(type_id: str, capex_usd: Optional[float]) -> float:
     return base
 
 
+@functools.lru_cache(maxsize=64)
 def recency_tier_from_year(year: Optional[int]) -> Optional[str]:
     if not year:
         return None
-    now = datetime.utcnow().year
-    age = now - year
+    age = _NOW_YEAR - year
     if age <= 1:
         return "A"
     elif age <= 3:
@@ -232,25 +280,147 @@ def recency_tier_from_year(year: Optional[int]) -> Optional[str]:
 # DATA FETCHING
 # ======================================================
 
-def fetch_csv(url: str) -> List[Dict[str, Any]]:
-    resp = requests.get(url, timeout=30)
-    resp.raise_for_status()
-    content = resp.content.decode("utf-8", errors="ignore")
-    f = io.StringIO(content)
-    return list(csv.DictReader(f))
-
-
-def load_state_source(cfg: StateSourceConfig) -> List[Dict[str, Any]]:
-    print(f"Fetching {cfg.name} ({cfg.state_code})")
-
-    if cfg.format == "csv":
-        rows = fetch_csv(cfg.url)
-    else:
-        resp = requests.get(cfg.url, timeout=30)
+# One keep-alive pool shared by all feeds; sized so every state can hold
+# a connection while they download in parallel.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=len(STATE_SOURCES), pool_maxsize=len(STATE_SOURCES),
+))
+
+# Rows parsed per pandas chunk while reading a CSV feed
+CSV_CHUNK_ROWS = 50_000
+
+# Last downloaded body of each feed, revalidated with ETag / Last-Modified
+FEED_CACHE_DIR = os.getenv(
+    "PROPAI_FEED_CACHE_DIR", os.path.join(tempfile.gettempdir(), "propai_state_feeds")
+)
+
+
+def fetch_feed(url: str) -> str:
+    """
+    Path to an up-to-date local copy of `url`. A conditional GET is sent
+    when a copy exists; on 304 Not Modified nothing is downloaded.
+    """
+    os.makedirs(FEED_CACHE_DIR, exist_ok=True)
+    path = os.path.join(FEED_CACHE_DIR, hashlib.sha1(url.encode()).hexdigest()[:16])
+    meta_path = path + ".json"
+
+    headers = {}
+    if os.path.exists(path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    with _SESSION.get(url, headers=headers, timeout=30, stream=True) as resp:
+        if resp.status_code == 304:
+            return path
         resp.raise_for_status()
-        data = resp.json()
-        rows = data if isinstance(data, list) else data.get("results", [])
 
+        # Body first, then its validators: a crash in between leaves stale
+        # validators, which only costs a full download next time.
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            for block in resp.iter_content(chunk_size=1 << 16):
+                f.write(block)
+        os.replace(tmp, path)
+
+        with open(tmp, "w") as f:
+            json.dump({
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            }, f)
+        os.replace(tmp, meta_path)
+    return path
+
+
+def _catalysts_from_frame(df: pd.DataFrame, cfg: StateSourceConfig) -> List[Dict[str, Any]]:
+    """
+    Column-wise equivalent of _catalysts_from_rows for a chunk of raw CSV
+    strings: clean every field, apply the rules as one mask, then build the
+    catalyst rows from the survivors.
+    """
+    capex = clean_numeric(df[cfg.capex_field])
+    jobs = clean_numeric(df[cfg.jobs_field]).round()
+    lat = clean_numeric(df[cfg.lat_field])
+    lng = clean_numeric(df[cfg.lng_field])
+    year = clean_year(df[cfg.year_field])
+    # A 0 year is skipped by passes_rules, the same as a missing one
+    year = year.where(year != 0)
+
+    # passes_rules, vectorized
+    recent = year.isna() | (_NOW_YEAR - year <= MAX_AGE_YEARS)
+    big = (capex >= MIN_CAPEX) | (jobs >= MIN_JOBS)
+    mask = lat.notna() & lng.notna() & recent & big
+
+    df = df[mask]
+    capex, jobs, lat, lng = capex[mask], jobs[mask].astype("Int64"), lat[mask], lng[mask]
+    year = year[mask]
+
+    name = df[cfg.project_name_field].str.strip()
+    if cfg.sector_field:
+        # Feeds repeat a handful of sector labels: classify each once
+        sectors = df[cfg.sector_field].str.strip()
+        type_ids = sectors.map({s: classify_type_id(s, cfg) for s in sectors.unique()})
+    else:
+        type_ids = pd.Series(cfg.default_type_id, index=df.index)
+
+    # infer_radius_miles, vectorized
+    base = type_ids.map(_BASE_RADIUS_MILES).fillna(_DEFAULT_BASE_RADIUS_MILES)
+    scale = np.clip(np.log10(capex.where(capex > 0)) - 5, 0.7, 1.5).fillna(1.0)
+
+    out = pd.DataFrame({
+        "name": name.where(name != "", f"{cfg.state_code} Project"),
+        "state": cfg.state_code,
+        "type": type_ids,
+        "lat": lat,
+        "lng": lng,
+        "radius_miles": base * scale,
+        "capex_usd": capex,
+        "jobs_estimated": jobs,
+        "recency_tier": year.map(recency_tier_from_year, na_action="ignore"),
+        # datetime(year, 1, 1).isoformat() + "Z"
+        "announced_at": (
+            year.astype("Int64").astype(str).str.zfill(4) + "-01-01T00:00:00Z"
+        ).where(year.notna()),
+    }, index=df.index)
+    # Cheaper than to_dict("records"), which re-boxes every cell
+    keys = list(out.columns)
+    columns = [out[k].to_numpy(dtype=object, na_value=None).tolist() for k in keys]
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+def iter_csv_chunks(cfg: StateSourceConfig) -> Iterator[pd.DataFrame]:
+    """
+    Parse a state CSV in C via pandas, CSV_CHUNK_ROWS rows at a time. Only
+    the configured fields are kept: text fields as strings ("" if missing),
+    numeric ones as parsed by pandas (NaN if empty, strings if unparseable).
+    """
+    text_fields = [f for f in (cfg.year_field, cfg.project_name_field, cfg.sector_field) if f]
+    fields = list(dict.fromkeys(
+        [cfg.capex_field, cfg.jobs_field, cfg.lat_field, cfg.lng_field] + text_fields
+    ))
+    chunks = pd.read_csv(
+        fetch_feed(cfg.url),
+        usecols=lambda c: c in fields,
+        dtype={f: str for f in text_fields},
+        keep_default_na=False,
+        na_values=[""],
+        float_precision="round_trip",  # same floats as float(s)
+        encoding="utf-8",
+        encoding_errors="ignore",
+        chunksize=CSV_CHUNK_ROWS,
+    )
+    with chunks:
+        for df in chunks:
+            # Missing columns / short rows, same as r.get() -> None
+            df = df.reindex(columns=fields)
+            yield df.fillna({f: "" for f in text_fields})
+
+
+def _catalysts_from_rows(rows: List[Dict[str, Any]], cfg: StateSourceConfig) -> List[Dict[str, Any]]:
     catalysts: List[Dict[str, Any]] = []
 
     for r in rows:
@@ -288,6 +458,22 @@ def load_state_source(cfg: StateSourceConfig) -> List[Dict[str, Any]]:
             "announced_at": announced_at,
         })
 
+    return catalysts
+
+
+def load_state_source(cfg: StateSourceConfig) -> List[Dict[str, Any]]:
+    print(f"Fetching {cfg.name} ({cfg.state_code})")
+
+    if cfg.format == "csv":
+        catalysts: List[Dict[str, Any]] = []
+        for chunk in iter_csv_chunks(cfg):
+            catalysts.extend(_catalysts_from_frame(chunk, cfg))
+    else:
+        with open(fetch_feed(cfg.url), "rb") as f:
+            data = json.load(f)
+        rows = data if isinstance(data, list) else data.get("results", [])
+        catalysts = _catalysts_from_rows(rows, cfg)
+
     print(f" → {len(catalysts)} projects passed for {cfg.state_code}")
     return catalysts
 
@@ -297,12 +483,21 @@ def load_state_source(cfg: StateSourceConfig) -> List[Dict[str, Any]]:
 # ======================================================
 
 def load_all_state_incentives() -> List[Dict[str, Any]]:
+    # Every feed is a blocking download, so fetch them all at once:
+    # wall time is the slowest state rather than the sum.
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    with ThreadPoolExecutor(max_workers=len(STATE_SOURCES)) as pool:
+        futures = {pool.submit(load_state_source, cfg): cfg for cfg in STATE_SOURCES}
+        for fut in as_completed(futures):
+            cfg = futures[fut]
+            try:
+                results[cfg.state_code] = fut.result()
+            except Exception as e:
+                print(f"ERROR loading {cfg.name}: {e}")
+
+    # Keep STATE_SOURCES order regardless of which feed finished first
     all_rows: List[Dict[str, Any]] = []
     for cfg in STATE_SOURCES:
-        try:
-            rows = load_state_source(cfg)
-            all_rows.extend(rows)
-        except Exception as e:
-            print(f"ERROR loading {cfg.name}: {e}")
+        all_rows.extend(results.get(cfg.state_code, []))
     print(f"Total state incentive catalysts loaded: {len(all_rows)}")
     return all_rows
@@ -0,0 +1,14 @@
+-- Unique key used by import_catalysts.upsert_catalysts
+-- (upsert ... on_conflict="name,state,type").
+
+-- Remove any duplicates left by the old select-then-insert importer,
+-- keeping a single row (the highest ctid) for each key.
+delete from public.catalysts a
+using public.catalysts b
+where a.ctid < b.ctid
+  and a.name = b.name
+  and a.state is not distinct from b.state
+  and a.type = b.type;
+
+create unique index if not exists catalysts_name_state_type_key
+  on public.catalysts (name, state, type);
@@ -0,0 +1,23 @@
+-- updated_at on catalysts, kept current by a trigger. main.py keys its
+-- on-disk catalyst array cache on (max(updated_at), count(*)).
+
+alter table public.catalysts
+  add column if not exists updated_at timestamptz not null default now();
+
+create or replace function public.set_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.updated_at = now();
+  return new;
+end;
+$$;
+
+drop trigger if exists catalysts_set_updated_at on public.catalysts;
+create trigger catalysts_set_updated_at
+  before update on public.catalysts
+  for each row execute function public.set_updated_at();
+
+create index if not exists catalysts_updated_at_idx
+  on public.catalysts (updated_at desc);
@@ -0,0 +1,22 @@
+# backend/supabase_client.py
+#
+# Shared Supabase client factory.
+# Every PostgREST call goes through one pooled, keep-alive HTTP/2 httpx
+# client, so repeated .execute() calls reuse a TLS connection instead of
+# paying a new handshake each time.
+
+import httpx
+from supabase import ClientOptions, create_client
+
+# Matches supabase-py's default postgrest_client_timeout, which no longer
+# applies once we pass our own httpx client.
+HTTP_TIMEOUT_SECONDS = 120
+
+
+def create_supabase_client(url, key):
+    http_client = httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=16),
+        timeout=HTTP_TIMEOUT_SECONDS,
+    )
+    return create_client(url, key, options=ClientOptions(httpx_client=http_client))
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+import catalyst_impact as ci
+
+
+def make_catalysts(lat, lng, radius, strength):
+    """CatalystArrays derived the same way as main.fetch_catalysts_from_supabase."""
+    r_max = radius * 2.5
+    decay_k = np.maximum(1.0, radius / 3)
+    lat_tol, lng_tol = ci.bbox_tolerances_deg(lat, r_max)
+    return ci.CatalystArrays(
+        lat=lat,
+        lng=lng,
+        r_peak_miles=radius,
+        r_max_miles=r_max,
+        decay_k_miles=decay_k,
+        base_strength=strength,
+        inv_decay_k=1.0 / decay_k,
+        lat_tol_deg=lat_tol,
+        lng_tol_deg=lng_tol,
+    ).build_index()
+
+
+def brute_force_score(plat, plng, c):
+    """The catalyst score straight from its definition, over every catalyst."""
+    d_lng = (c.lng - plng + 180.0) % 360.0 - 180.0
+    d = ci.MILES_PER_DEGREE * np.hypot(c.lat - plat, d_lng * np.cos(np.radians(plat)))
+    w = np.where(
+        d <= c.r_peak_miles,
+        1.0,
+        np.where(d >= c.r_max_miles, 0.0, np.exp((c.r_peak_miles - d) / c.decay_k_miles)),
+    )
+    hit = w > 0
+    strength_sum = c.base_strength[hit].sum()
+    if strength_sum == 0:
+        return 0.0
+    return min(max((w[hit] * c.base_strength[hit]).sum() / strength_sum, 0.0), 1.5)
+
+
+def dataset(name, rng):
+    """(catalysts, parcel lats, parcel lngs) for one region of the globe."""
+    n = 1500
+    if name == "global":
+        lat = rng.uniform(-90, 90, n)
+        lng = rng.uniform(-180, 180, n)
+    elif name == "poles":
+        lat = rng.choice([-1, 1], n) * rng.uniform(80, 90, n)
+        lng = rng.uniform(-180, 180, n)
+    else:  # antimeridian
+        lat = rng.uniform(-70, 70, n)
+        lng = (rng.uniform(175, 185, n) + 180.0) % 360.0 - 180.0
+    catalysts = make_catalysts(lat, lng, rng.uniform(2, 40, n), rng.uniform(0.5, 9, n))
+
+    # Parcels near catalysts (so most scores are non-trivial), plus the
+    # poles and the antimeridian themselves
+    pick = rng.integers(0, n, 400)
+    plats = np.clip(lat[pick] + rng.uniform(-0.5, 0.5, 400), -90, 90)
+    plngs = (lng[pick] + rng.uniform(-1, 1, 400) + 180.0) % 360.0 - 180.0
+    plats = np.concatenate([plats, [90.0, -90.0, 0.0, 45.0, -45.0]])
+    plngs = np.concatenate([plngs, [0.0, 180.0, 180.0, -180.0, 179.999]])
+    return catalysts, plats, plngs
+
+
+@pytest.fixture(params=["kernel", "numpy"])
+def scorer(request, monkeypatch):
+    if request.param == "kernel":
+        if ci._score_kernel is None:
+            pytest.skip("numba not installed")
+    else:
+        monkeypatch.setattr(ci, "_score_kernel", None)
+        monkeypatch.setattr(ci, "_score_batch_kernel", None)
+    return request.param
+
+
+@pytest.mark.parametrize("region", ["global", "poles", "antimeridian"])
+def test_scores_match_brute_force(scorer, region):
+    catalysts, plats, plngs = dataset(region, np.random.default_rng(0))
+    expected = np.array([brute_force_score(a, b, catalysts) for a, b in zip(plats, plngs)])
+    assert (expected > 0).sum() > len(expected) // 2
+
+    single = [ci.compute_catalyst_score_for_parcel(a, b, catalysts) for a, b in zip(plats, plngs)]
+    batch = ci.compute_catalyst_scores_for_parcels(plats, plngs, catalysts)
+
+    np.testing.assert_allclose(single, expected, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(batch, expected, rtol=0, atol=1e-12)
+
+
+def test_matrix_round_trip_keeps_band_order():
+    catalysts, plats, plngs = dataset("global", np.random.default_rng(1))
+    mapped = ci.CatalystArrays.from_matrix(catalysts.to_matrix())
+
+    np.testing.assert_array_equal(mapped.band_starts, catalysts.band_starts)
+    np.testing.assert_array_equal(
+        ci.compute_catalyst_scores_for_parcels(plats, plngs, mapped),
+        ci.compute_catalyst_scores_for_parcels(plats, plngs, catalysts),
+    )